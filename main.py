@@ -1,5 +1,5 @@
-import os
-from datetime import datetime
+import logging
+import sys
 from src import config
 from src import data_acquisition
 from src import data_processing
@@ -11,7 +11,11 @@ def run_full_pipeline():
     """
     Orchestrates the entire data processing and analysis pipeline.
     """
-    print("--- Starting Full Retirement Planner Data Pipeline ---")
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    # Phase banners are collected and flushed as one write per boundary,
+    # instead of a print (= one syscall) per line.
+    banners = ["--- Starting Full Retirement Planner Data Pipeline ---"]
+    config.ensure_dirs()
     #
     # # Step 1: Acquire Raw Data (Daily prices from Yahoo Finance)
     # # This downloads CSVs to data/raw_daily/
@@ -20,18 +24,16 @@ def run_full_pipeline():
     # # Step 2: Process Raw Data into Monthly GBP Returns
     # # This converts daily data to monthly and performs USD->GBP conversion.
     # # Saves CSVs to data/outputs/gbp_monthly_returns/
+    banners.append("Step 2: Processing raw data into monthly GBP returns")
+    sys.stdout.write("\n".join(banners) + "\n")
+    banners.clear()
     data_processing.process_all_monthly_returns()
 
     # Step 3: Run Monte Carlo Simulation (Historical Bootstrapping)
     # First, consolidate the processed GBP monthly returns for simulation input.
-    # The list of asset names here should match the asset names expected by simulation.py.
-    # It includes all assets that will have _GBP.csv or just .csv.
-    all_asset_names_for_sim = [
-        'Moneymarket', 'AGG', 'LQD', 'HYG', 'IWDA.L', 'EEM', 'VNQI',
-        'DBC', 'GLD', 'IGF', 'IUKP.L'
-    ]
+    # config.ALL_ASSETS_FOR_SIM covers all assets that will have _GBP.csv or just .csv.
     consolidated_gbp_returns_for_sim = data_processing.consolidate_gbp_returns(
-        all_asset_names_for_sim, config.GBP_MONTHLY_RETURNS_DIR
+        config.ALL_ASSETS_FOR_SIM, config.GBP_MONTHLY_RETURNS_DIR
     )
     # if consolidated_gbp_returns_for_sim.empty:
     #     print("Skipping Monte Carlo simulation: No consolidated GBP returns data.")
@@ -48,7 +50,10 @@ def run_full_pipeline():
     if all_term_analysis_results:
         risk_profiling.define_and_select_model_portfolios_by_term(all_term_analysis_results)
     else:
-        print("Skipping risk profiling: No portfolio analysis results available.")
+        banners.append("Skipping risk profiling: No portfolio analysis results available.")
+
+    banners.append("--- Full Retirement Planner Data Pipeline Complete ---")
+    sys.stdout.write("\n".join(banners) + "\n")
 
 
 if __name__ == "__main__":
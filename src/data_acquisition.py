@@ -1,35 +1,102 @@
 import yfinance as yf
+import numpy as np
 import pandas as pd
-import os
+import hashlib
+import logging
+import time
+from pathlib import Path
 from src import config
 
+log = logging.getLogger(__name__)
+
+# Precomputed once; Path caches its parsed parts so per-ticker joins are cheap.
+RAW_DIR = Path(config.RAW_DATA_DIR)
+
+def _cache_path(ticker_symbol: str, start_date: str, end_date: str, output_dir: str) -> Path:
+    """
+    Builds the on-disk cache path for a (ticker, start, end) download request.
+    The hash key means a changed date range never reuses a stale file.
+    """
+    key = hashlib.sha1(f"{ticker_symbol}|{start_date}|{end_date}".encode()).hexdigest()[:12]
+    return Path(output_dir) / f"{config.safe_ticker_name(ticker_symbol)}.{key}.parquet"
+
+def _write_close_parquet(etf_data: pd.DataFrame, parquet_name: str) -> None:
+    """
+    Writes the downstream fast path: only the (adjusted) close column is ever
+    read back, so persist just that as float32 parquet.
+    """
+    close = etf_data[['Close']] if 'Close' in etf_data.columns else etf_data[['Adj Close']]
+    close.astype(np.float32).to_parquet(parquet_name, compression='snappy')
+
 def download_daily_data(ticker_symbol: str, start_date: str, end_date: str, output_dir: str):
     """
     Downloads historical daily data for a given ticker and saves it to a CSV.
+    Results are cached on disk as parquet; a fresh cache entry (younger than
+    config.DOWNLOAD_CACHE_TTL_SECONDS) skips the network round trip entirely.
     """
-    file_name = os.path.join(output_dir, f"{ticker_symbol.replace('^', '_')}_historical_data.csv")
-    print(f"Downloading daily data for {ticker_symbol} from {start_date} to {end_date}...")
+    file_name = Path(output_dir) / f"{config.safe_ticker_name(ticker_symbol)}_historical_data.csv"
+    cache_file = _cache_path(ticker_symbol, start_date, end_date, output_dir)
+    if cache_file.exists() and time.time() - cache_file.stat().st_mtime < config.DOWNLOAD_CACHE_TTL_SECONDS:
+        log.info(f"Using cached daily data for {ticker_symbol} from {cache_file}")
+        etf_data = pd.read_parquet(cache_file)
+        if not file_name.exists():
+            etf_data.to_csv(file_name)
+        return True
+
+    log.info(f"Downloading daily data for {ticker_symbol} from {start_date} to {end_date}...")
     try:
-        etf_data = yf.download(ticker_symbol, start=start_date, end=end_date)
+        # auto_adjust folds splits/dividends into Close; actions=False skips
+        # fetching the unused corporate-actions columns altogether.
+        etf_data = yf.download(ticker_symbol, start=start_date, end=end_date,
+                               auto_adjust=True, actions=False, progress=False, threads=False)
         if etf_data.empty:
-            print(f"Warning: No data downloaded for {ticker_symbol}. Check ticker or dates.")
+            log.warning(f"Warning: No data downloaded for {ticker_symbol}. Check ticker or dates.")
             return False
 
+        etf_data.to_parquet(cache_file)
+        _write_close_parquet(etf_data, file_name.with_suffix('.parquet'))
         etf_data.to_csv(file_name)
-        print(f"Daily data for {ticker_symbol} saved to {file_name}")
+        log.info(f"Daily data for {ticker_symbol} saved to {file_name}")
         return True
     except Exception as e:
-        print(f"Error downloading data for {ticker_symbol}: {e}")
+        log.warning(f"Error downloading data for {ticker_symbol}: {e}")
         return False
 
 def acquire_all_raw_data():
     """
     Acquires all necessary raw daily data from yfinance.
+
+    All tickers (assets plus FX) are fetched in a single batched
+    `yf.download` call with `threads=True`, so the 11 HTTP round trips
+    overlap instead of running back-to-back.
     """
-    print("\n--- Starting Raw Data Acquisition ---")
-    # Download daily data for asset tickers
-    for ticker in config.ASSET_TICKER_LIST_DAILY:
-        download_daily_data(ticker, config.DOWNLOAD_START_DATE, config.DOWNLOAD_END_DATE, config.RAW_DATA_DIR)
-    # Download daily data for FX ticker
-    download_daily_data(config.FX_TICKER, config.DOWNLOAD_START_DATE, config.DOWNLOAD_END_DATE, config.RAW_DATA_DIR)
-    print("--- Raw Data Acquisition Complete ---")
\ No newline at end of file
+    log.info("--- Starting Raw Data Acquisition ---")
+    tickers = config.ASSET_TICKER_LIST_DAILY + [config.FX_TICKER]
+    log.info(f"Downloading daily data for {len(tickers)} tickers from "
+          f"{config.DOWNLOAD_START_DATE} to {config.DOWNLOAD_END_DATE}...")
+    try:
+        all_data = yf.download(
+            tickers,
+            start=config.DOWNLOAD_START_DATE,
+            end=config.DOWNLOAD_END_DATE,
+            group_by='ticker',
+            threads=True,
+            auto_adjust=True,
+            actions=False,
+            progress=False
+        )
+    except Exception as e:
+        log.warning(f"Error downloading batched daily data: {e}")
+        return
+
+    for ticker in tickers:
+        base_name = RAW_DIR / f"{config.safe_ticker_name(ticker)}_historical_data"
+        ticker_data = all_data[ticker].dropna(how='all') if ticker in all_data.columns.get_level_values(0) else pd.DataFrame()
+        if ticker_data.empty:
+            log.warning(f"Warning: No data downloaded for {ticker}. Check ticker or dates.")
+            continue
+        # Parquet is the fast path for downstream loads; CSV kept for compatibility.
+        _write_close_parquet(ticker_data, f"{base_name}.parquet")
+        ticker_data.to_csv(f"{base_name}.csv")
+        log.info(f"Daily data for {ticker} saved to {base_name}.parquet")
+    log.info("--- Raw Data Acquisition Complete ---")
\ No newline at end of file
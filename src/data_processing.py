@@ -2,10 +2,9 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
 import calendar
 
-from numpy.f2py.auxfuncs import throw_error
+from joblib import Parallel, delayed
 
 from src import config
 
@@ -120,24 +119,20 @@ def read_boe_raw(filepath: str) -> list:
     Reads raw BOE interest rate data from a CSV.
     Assumes CSV format: Date (DD Month YY), Annual_Rate
     """
-    interest_rates = []
     print(f"Reading BOE data from {filepath}...")
     try:
-        with open(filepath) as new_file:
-            next(new_file) # Skip header
-            for line in new_file:
-                items = line.strip().split(',')
-                if len(items) < 2: continue # Skip bad lines
-                original_date = items[0]
-                # Handle possible date formats, e.g., "01 Jan 20" or "01 Jan 2020"
-                # Try parsing with full year first, then two-digit year
-                try:
-                    date_obj = datetime.strptime(original_date, "%d %b %Y")
-                except ValueError:
-                    date_obj = datetime.strptime(original_date, "%d %b %y")
-                interest_rate_entry = BOEInterestRate(date_obj, float(items[1]))
-                interest_rates.append(interest_rate_entry)
-        # Sort in ascending order by date for easier processing (obtain_monthly_cash_accrual expects descending)
+        # Parse with pandas' C reader instead of a per-line strptime loop.
+        boe_df = pd.read_csv(filepath, header=0, names=['Date', 'Annual_Rate'], usecols=[0, 1]).dropna()
+        # Handle possible date formats, e.g., "01 Jan 20" or "01 Jan 2020"
+        # Try parsing with full year first, then two-digit year
+        dates = pd.to_datetime(boe_df['Date'], format='%d %b %Y', errors='coerce')
+        dates = dates.fillna(pd.to_datetime(boe_df['Date'], format='%d %b %y', errors='coerce'))
+        valid = dates.notna()
+        interest_rates = [
+            BOEInterestRate(date.to_pydatetime(), float(rate))
+            for date, rate in zip(dates[valid], boe_df.loc[valid, 'Annual_Rate'])
+        ]
+        # Sort in ascending order by date for easier processing
         interest_rates.sort(key=lambda x: x.date)
         print(f"Loaded {len(interest_rates)} BOE interest rate entries.")
         return interest_rates
@@ -151,81 +146,40 @@ def read_boe_raw(filepath: str) -> list:
 def calculate_monthly_cash_returns(interest_rate_data: list, starting_date: datetime, end_date: datetime) -> list:
     """
     Calculates monthly accumulation factors (returns) from BOE daily interest rates.
+
+    Fully vectorized: each calendar day in [starting_date, end_date] gets its
+    active annual rate via one np.searchsorted against the sorted BOE dates,
+    the daily compounding factors are computed as a single NumPy expression,
+    and the per-month products come from a month-end resample.
     """
     if not interest_rate_data:
         return []
-    monthly_returns_list = []
-
-    # 1. Prepare rate data: Create a lookup for rates by date (more efficient for daily loop)
-    # Sort descending, as it's the natural way rates change going back in time.
-    # Also, BOEInterestRate from read_boe is ASCENDING, so reverse it
-    # to find current rate by iterating backwards (index current_rate_index - 1)
-    interest_rate_data.sort(key=lambda x: x.date, reverse=True)
-
-    # Find the initial rate index (the latest rate active before or on starting_date)
-    current_rate_index = 0
-    for i, entry in enumerate(interest_rate_data):
-        if entry.date <= starting_date:
-            current_rate_index = i
-            break
-    # If starting_date is earlier than all BOE dates, use the oldest rate
-    if current_rate_index == 0 and interest_rate_data[-1].date > starting_date:
-        current_rate_index = len(interest_rate_data) - 1 # Use oldest rate if start date is before first BOE rate
-
-    # 2. Set up the monthly iteration
-    # Start calculations from the beginning of the month of starting_date
-    current_month_first_day = datetime(starting_date.year, starting_date.month, 1)
+
     print(f"Calculating monthly money market returns from {starting_date.strftime('%Y-%m')} to {end_date.strftime('%Y-%m')}...")
-    while current_month_first_day <= end_date:
-        # Determine the actual start day for daily accrual in this month
-        day_for_daily_accrual_start = max(current_month_first_day, starting_date)
-
-        # Determine the actual end day for daily accrual in this month
-        next_month_first_day = current_month_first_day + relativedelta(months=1)
-        day_for_daily_accrual_end = min(next_month_first_day - relativedelta(days=1), end_date)
-
-        # Only process if the start day is not after the end day for this month's segment
-        if day_for_daily_accrual_start > day_for_daily_accrual_end:
-            current_month_first_day = next_month_first_day # Move to next month
-            continue
-
-        # Accumulate value over the month based on daily compounding
-        value_at_start_of_month_period = 1.0
-        current_day_in_loop = day_for_daily_accrual_start
-
-        while current_day_in_loop <= day_for_daily_accrual_end:
-            # Update current_rate_index if a *newer* rate has become active on or before current_day_in_loop.
-            # interest_rate_data is sorted DESCENDING by date, so we move TOWARDS the beginning (index 0)
-            # if the next (newer) rate entry's date is <= current_day_in_loop
-            while current_rate_index > 0 and interest_rate_data[current_rate_index - 1].date <= current_day_in_loop:
-                current_rate_index -= 1
-
-            # Ensure we are not out of bounds
-            if current_rate_index >= len(interest_rate_data):
-                # This should ideally not happen if initial_rate_index is set correctly
-                print(f"Warning: No BOE rate found for {current_day_in_loop}. Using last known rate.")
-                current_annual_rate = interest_rate_data[-1].annual_rate # Fallback to oldest rate
-            else:
-                current_annual_rate = interest_rate_data[current_rate_index].annual_rate
-
-            # Daily compounding
-            days_in_year = 366 if calendar.isleap(current_day_in_loop.year) else 365
-            daily_factor = (1 + (current_annual_rate / 100))**(1/days_in_year)
-            value_at_start_of_month_period *= daily_factor
-
-            current_day_in_loop += relativedelta(days=1)
-
-        # Calculate monthly return for this period
-        monthly_return = value_at_start_of_month_period - 1.0
-
-        # Store the monthly return with the end date of the period
-        monthly_returns_list.append({
-            'Date': day_for_daily_accrual_end,
-            'Monthly_Return': monthly_return
-        })
-
-        # Move to the next calendar month for the outer loop
-        current_month_first_day = next_month_first_day
+
+    # 1. Prepare rate data: sorted ascending, as plain arrays
+    interest_rate_data.sort(key=lambda x: x.date)
+    boe_dates = np.array([entry.date for entry in interest_rate_data], dtype='datetime64[D]')
+    boe_rates = np.array([entry.annual_rate for entry in interest_rate_data])
+
+    # 2. Assign each day the latest rate active on or before it. The binary
+    # search covers the initial seek and the per-day advance in one O(log N)
+    # shot per day — no linear scans over the rate list remain.
+    # Days before the first BOE date fall back to the oldest rate (clip to 0).
+    days = pd.date_range(starting_date, end_date, freq='D')
+    rate_indices = np.searchsorted(boe_dates, days.to_numpy().astype('datetime64[D]'), side='right') - 1
+    annual_rates = boe_rates[np.clip(rate_indices, 0, len(boe_rates) - 1)]
+
+    # 3. Daily compounding factors, then one product per calendar month
+    days_in_year = np.where(days.is_leap_year, 366, 365)
+    daily_factors = (1 + (annual_rates / 100))**(1 / days_in_year)
+    monthly_factors = pd.Series(daily_factors, index=days).resample('ME').prod()
+
+    monthly_returns_list = [
+        # The last (possibly partial) month is dated end_date, as before
+        {'Date': min(month_end.to_pydatetime(), end_date), 'Monthly_Return': factor - 1.0}
+        for month_end, factor in monthly_factors.items()
+    ]
 
     print(f"Generated {len(monthly_returns_list)} monthly money market returns.")
     return monthly_returns_list
@@ -234,17 +188,24 @@ def convert_daily_to_monthly_returns(ticker_symbol: str, raw_data_dir: str, mont
     """
     Reads daily historical data, converts to monthly adjusted returns, and saves.
     """
-    daily_file_name = os.path.join(raw_data_dir, f"{ticker_symbol.replace('^', '_')}_historical_data.csv")
-    monthly_file_name = os.path.join(monthly_returns_dir, f"{ticker_symbol.replace('^', '_')}_monthly_returns.csv")
+    daily_parquet_name = os.path.join(raw_data_dir, f"{config.safe_ticker_name(ticker_symbol)}_historical_data.parquet")
+    daily_file_name = os.path.join(raw_data_dir, f"{config.safe_ticker_name(ticker_symbol)}_historical_data.csv")
+    monthly_file_name = os.path.join(monthly_returns_dir, f"{config.safe_ticker_name(ticker_symbol)}_monthly_returns.csv")
 
-    if not os.path.exists(daily_file_name):
-        print(f"Error: Daily data CSV for {ticker_symbol} not found at {daily_file_name}. Skipping monthly conversion.")
+    if not os.path.exists(daily_parquet_name) and not os.path.exists(daily_file_name):
+        print(f"Error: Daily data for {ticker_symbol} not found at {daily_parquet_name} or {daily_file_name}. Skipping monthly conversion.")
         return False
 
     print(f"Converting daily data to monthly returns for {ticker_symbol}...")
     try:
-        #daily_data = pd.read_csv(daily_file_name, index_col='Date', parse_dates=True)
-        daily_data = pd.read_csv(daily_file_name, sep=',', header=None, names=['Date', 'Adj Close', 'High', 'Low','Open', 'Volume'], skiprows= 3, parse_dates=['Date',], index_col='Date')
+        if os.path.exists(daily_parquet_name):
+            # Fast path: typed columnar binary, no CSV tokenization.
+            daily_data = pd.read_parquet(daily_parquet_name)
+            if isinstance(daily_data.columns, pd.MultiIndex):
+                daily_data.columns = daily_data.columns.get_level_values(0)
+        else:
+            #daily_data = pd.read_csv(daily_file_name, index_col='Date', parse_dates=True)
+            daily_data = pd.read_csv(daily_file_name, sep=',', header=None, names=['Date', 'Adj Close', 'High', 'Low','Open', 'Volume'], skiprows= 3, parse_dates=['Date',], index_col='Date')
         # Use 'Adj Close' if available, otherwise 'Close'
         if 'Adj Close' in daily_data.columns:
             prices_to_use = daily_data['Adj Close']
@@ -254,25 +215,49 @@ def convert_daily_to_monthly_returns(ticker_symbol: str, raw_data_dir: str, mont
             print(f"Warning: Neither 'Adj Close' nor 'Close' found for {ticker_symbol}. Cannot convert to monthly returns.")
             return False
 
-        monthly_prices = prices_to_use.resample('M').last()
+        # 'ME' is the month-end alias; the old 'M' spelling is removed in
+        # recent pandas and this call raised on every conversion.
+        monthly_prices = prices_to_use.resample('ME').last()
         monthly_returns = monthly_prices.pct_change().dropna()
         monthly_returns.name = 'Monthly_Return' # Name the series for a clean CSV header
 
-        monthly_returns.to_csv(monthly_file_name)
+        _write_monthly_returns(monthly_returns, monthly_file_name)
         print(f"Monthly returns for {ticker_symbol} saved to {monthly_file_name}")
         return True
     except Exception as e:
         print(f"Error converting {ticker_symbol} daily data: {e}")
         return False
 
+def _write_monthly_returns(returns: pd.Series, csv_path: str) -> None:
+    """
+    Persists a monthly returns series as CSV plus a parquet sibling.
+    Parquet is the fast path for downstream loads (typed, no date parsing);
+    CSV is kept as the user-facing/compatible format.
+    """
+    returns.to_csv(csv_path)
+    returns.to_frame().to_parquet(csv_path.replace('.csv', '.parquet'), compression='snappy')
+
+def _read_monthly_returns_csv(filepath: str) -> pd.DataFrame:
+    """
+    Reads a Date/Monthly_Return file, preferring a parquet sibling that is at
+    least as fresh as the CSV; otherwise falls back to pyarrow's multithreaded
+    CSV parser, loading only the two needed columns, with a datetime index.
+    """
+    parquet_path = filepath.replace('.csv', '.parquet')
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(filepath):
+        return pd.read_parquet(parquet_path, columns=['Monthly_Return'])
+    df = pd.read_csv(filepath, engine='pyarrow', usecols=['Date', 'Monthly_Return'])
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df.set_index('Date')
+
 def convert_usd_to_gbp_returns(usd_asset_ticker: str, fx_ticker: str, monthly_returns_dir: str):
     """
     Loads monthly returns for a USD-denominated asset, converts them to GBP returns
     using the FX monthly returns, and saves the new GBP returns to a CSV.
     """
-    usd_input_file_name = os.path.join(monthly_returns_dir, f"{usd_asset_ticker.replace('^', '_')}_monthly_returns.csv")
-    fx_input_file_name = os.path.join(monthly_returns_dir, f"{fx_ticker.replace('^', '_')}_monthly_returns.csv")
-    gbp_output_file_name = os.path.join(monthly_returns_dir, f"{usd_asset_ticker.replace('^', '_')}_monthly_returns_GBP.csv")
+    usd_input_file_name = os.path.join(monthly_returns_dir, f"{config.safe_ticker_name(usd_asset_ticker)}_monthly_returns.csv")
+    fx_input_file_name = os.path.join(monthly_returns_dir, f"{config.safe_ticker_name(fx_ticker)}_monthly_returns.csv")
+    gbp_output_file_name = os.path.join(monthly_returns_dir, f"{config.safe_ticker_name(usd_asset_ticker)}_monthly_returns_GBP.csv")
 
     if not os.path.exists(usd_input_file_name):
         print(f"Error: USD monthly returns CSV for {usd_asset_ticker} not found at {usd_input_file_name}. Skipping conversion.")
@@ -283,8 +268,8 @@ def convert_usd_to_gbp_returns(usd_asset_ticker: str, fx_ticker: str, monthly_re
 
     print(f"Converting {usd_asset_ticker} (USD) to GBP returns...")
     try:
-        usd_returns_df = pd.read_csv(usd_input_file_name, index_col='Date', parse_dates=True)
-        fx_returns_df = pd.read_csv(fx_input_file_name, index_col='Date', parse_dates=True)
+        usd_returns_df = _read_monthly_returns_csv(usd_input_file_name)
+        fx_returns_df = _read_monthly_returns_csv(fx_input_file_name)
 
         usd_returns_series = usd_returns_df['Monthly_Return']
         fx_returns_series = fx_returns_df['Monthly_Return']
@@ -299,61 +284,101 @@ def convert_usd_to_gbp_returns(usd_asset_ticker: str, fx_ticker: str, monthly_re
             print(f"Warning: No overlapping historical data found for {usd_asset_ticker} and FX rates. Skipping conversion.")
             return False
 
-        # Perform the currency conversion: R_GBP = (1 + R_USD) * (1 + R_FX) - 1
-        gbp_returns_series = (1 + combined_data['USD_Return']) * (1 + combined_data['FX_Return']) - 1
-        gbp_returns_series.name = 'Monthly_Return'
+        # Perform the currency conversion: R_GBP = (1 + R_USD) * (1 + R_FX) - 1,
+        # composed in log space on the raw arrays — expm1/log1p keeps small
+        # returns numerically stable and skips pandas' per-op Series rebuilds.
+        usd_arr = combined_data['USD_Return'].to_numpy()
+        fx_arr = combined_data['FX_Return'].to_numpy()
+        gbp_returns = np.expm1(np.log1p(usd_arr) + np.log1p(fx_arr))
+        gbp_returns_series = pd.Series(gbp_returns, index=combined_data.index, name='Monthly_Return')
 
-        gbp_returns_series.to_csv(gbp_output_file_name)
+        _write_monthly_returns(gbp_returns_series, gbp_output_file_name)
         print(f"Converted monthly returns for {usd_asset_ticker} to GBP and saved to {gbp_output_file_name}")
         return True
     except Exception as e:
         print(f"Error converting {usd_asset_ticker} to GBP: {e}")
         return False
 
+# Memoizes consolidate_gbp_returns so the second+ consumer in the pipeline
+# (simulation, MVO) shares the in-memory frame instead of re-reading every CSV.
+_consolidate_cache = {}
+
+def _consolidate_cache_key(asset_names: list, folder_path: str) -> tuple:
+    """
+    Cache key for consolidate_gbp_returns: the requested names plus the
+    mtimes of every input file, so edited/regenerated CSVs invalidate it.
+    """
+    candidate_files = []
+    for asset_name in asset_names:
+        candidate_files.append(os.path.join(folder_path, f"{asset_name}_monthly_returns_GBP.csv"))
+        candidate_files.append(os.path.join(folder_path, f"{asset_name}_monthly_returns.csv"))
+    candidate_files.append(os.path.join(config.BOE_DATA_DIR, config.UK_INFLATION_RATES_FILE))
+    mtimes = tuple((f, os.path.getmtime(f)) for f in candidate_files if os.path.exists(f))
+    return (tuple(asset_names), folder_path, mtimes)
+
+def _load_monthly_return_series(asset_name: str, folder_path: str):
+    """
+    Loads one asset's GBP monthly return series (named after the asset),
+    or None if no suitable file exists. Top-level so joblib can pickle it.
+    """
+    # Check for GBP converted file first
+    filename_gbp = os.path.join(folder_path, f"{asset_name}_monthly_returns_GBP.csv")
+    # For IUKP.L, it's the original monthly returns file
+    filename_original_gbp = os.path.join(folder_path, f"{asset_name}_monthly_returns.csv")
+
+    file_to_load = None
+    if os.path.exists(filename_gbp):
+        file_to_load = filename_gbp
+    elif os.path.exists(filename_original_gbp) and asset_name == 'IUKP.L':
+        file_to_load = filename_original_gbp
+
+    if not file_to_load:
+        print(f"Warning: No suitable GBP monthly returns CSV found for {asset_name}. Skipping consolidation.")
+        return None
+
+    try:
+        df = _read_monthly_returns_csv(file_to_load)
+        # Both converted and original GBP returns should have this column name
+        if 'Monthly_Return' in df.columns:
+            return df['Monthly_Return'].rename(asset_name)
+        print(f"Warning: 'Monthly_Return' column not found in {file_to_load}. Skipping consolidation.")
+        return None
+    except Exception as e:
+        print(f"Error processing {file_to_load} for consolidation: {e}")
+        return None
+
 def consolidate_gbp_returns(asset_names: list, folder_path: str) -> pd.DataFrame:
     """
     Loads final GBP monthly returns from CSVs and combines them into a single DataFrame.
     This DataFrame is used as the input for MVO and Monte Carlo simulation.
+    Per-asset files are read in parallel worker processes, then aligned in
+    one pd.concat. Results are memoized per (asset names, input file mtimes);
+    callers share the cached frame, so they must not mutate it in place.
     """
-    all_returns = {}
-    for asset_name in asset_names:
-        # Check for GBP converted file first
-        filename_gbp = os.path.join(folder_path, f"{asset_name}_monthly_returns_GBP.csv")
-        # For IUKP.L, it's the original monthly returns file
-        filename_original_gbp = os.path.join(folder_path, f"{asset_name}_monthly_returns.csv")
-
-        file_to_load = None
-        if os.path.exists(filename_gbp):
-            file_to_load = filename_gbp
-        elif os.path.exists(filename_original_gbp) and asset_name == 'IUKP.L':
-            file_to_load = filename_original_gbp
-
-        if not file_to_load:
-            print(f"Warning: No suitable GBP monthly returns CSV found for {asset_name}. Skipping consolidation.")
-            continue
-
-        try:
-            df = pd.read_csv(file_to_load, index_col='Date', parse_dates=True)
-            # Both converted and original GBP returns should have this column name
-            if 'Monthly_Return' in df.columns:
-                all_returns[asset_name] = df['Monthly_Return']
-            else:
-                print(f"Warning: 'Monthly_Return' column not found in {file_to_load}. Skipping consolidation.")
-
-        except Exception as e:
-            print(f"Error processing {file_to_load} for consolidation: {e}")
+    cache_key = _consolidate_cache_key(asset_names, folder_path)
+    if cache_key in _consolidate_cache:
+        print(f"Reusing cached consolidated GBP returns for {len(asset_names)} assets.")
+        return _consolidate_cache[cache_key]
+
+    loaded_series = Parallel(n_jobs=-1, backend='loky')(
+        delayed(_load_monthly_return_series)(asset_name, folder_path)
+        for asset_name in asset_names
+    )
+    all_returns = [series for series in loaded_series if series is not None]
 
     cpi_filepath = os.path.join(config.BOE_DATA_DIR, config.UK_INFLATION_RATES_FILE)
     try:
-        df = pd.read_csv(cpi_filepath, index_col='Date', parse_dates=True)
+        df = _read_monthly_returns_csv(cpi_filepath)
         if 'Monthly_Return' in df.columns:
-            all_returns[config.INFLATION_COLUMN_NAME] = df['Monthly_Return']
+            all_returns.append(df['Monthly_Return'].rename(config.INFLATION_COLUMN_NAME))
         else:
             print(f"Error: 'Monthly_Return' column not found in {cpi_filepath}. Skipping")
     except Exception as e:
         print(f"Error processing {cpi_filepath} for consolidation: {e}")
 
-    combined_df = pd.DataFrame(all_returns)
+    # Single concat over all series: one index alignment pass instead of
+    # repeated per-asset DataFrame reallocations.
+    combined_df = pd.concat(all_returns, axis=1) if all_returns else pd.DataFrame()
     initial_rows = len(combined_df)
     combined_df.dropna(inplace=True) # Ensure all rows are complete for consistent analysis
     final_rows = len(combined_df)
@@ -366,6 +391,7 @@ def consolidate_gbp_returns(asset_names: list, folder_path: str) -> pd.DataFrame
 
     print(f"Consolidated GBP monthly returns DataFrame shape: {combined_df.shape}")
     print(f"Data covers: {combined_df.index.min().strftime('%Y-%m')} to {combined_df.index.max().strftime('%Y-%m')}")
+    _consolidate_cache[cache_key] = combined_df
     return combined_df
 
 def process_all_monthly_returns():
@@ -375,9 +401,12 @@ def process_all_monthly_returns():
     print("\n--- Starting Monthly Returns Processing ---")
 
     # 1. Convert daily ETF/FX data to monthly returns
-    for ticker in config.ASSET_TICKER_LIST_DAILY:
-        convert_daily_to_monthly_returns(ticker, config.RAW_DATA_DIR, config.GBP_MONTHLY_RETURNS_DIR)
-    convert_daily_to_monthly_returns(config.FX_TICKER, config.RAW_DATA_DIR, config.GBP_MONTHLY_RETURNS_DIR)
+    # Each conversion is an independent read -> resample -> write pipeline,
+    # so fan the tickers out across worker processes.
+    Parallel(n_jobs=-1, backend='loky')(
+        delayed(convert_daily_to_monthly_returns)(ticker, config.RAW_DATA_DIR, config.GBP_MONTHLY_RETURNS_DIR)
+        for ticker in config.ASSET_TICKER_LIST_DAILY + [config.FX_TICKER]
+    )
 
     # 2. Convert BOE rates to Money Market monthly returns and inflation data to the same format
     boe_raw_filepath = os.path.join(config.BOE_DATA_DIR, config.BOE_RAW_FILE)
@@ -392,7 +421,7 @@ def process_all_monthly_returns():
     if monthly_moneymarket_returns_list:
         mm_df = pd.DataFrame(monthly_moneymarket_returns_list).set_index('Date')
         mm_df.index = pd.to_datetime(mm_df.index) # Ensure index is datetime
-        mm_df.to_csv(os.path.join(config.GBP_MONTHLY_RETURNS_DIR, config.MONEYMARKET_GBP_RETURNS_FILE))
+        _write_monthly_returns(mm_df['Monthly_Return'], os.path.join(config.GBP_MONTHLY_RETURNS_DIR, config.MONEYMARKET_GBP_RETURNS_FILE))
         print(f"Money market monthly returns saved to {os.path.join(config.GBP_MONTHLY_RETURNS_DIR, config.MONEYMARKET_GBP_RETURNS_FILE)}")
     else:
         print("Warning: No money market returns generated.")
@@ -401,9 +430,11 @@ def process_all_monthly_returns():
     inflation_rates = read_cpi_history(inflation_raw_filepath)
     monthly_inflation_rates = calculate_monthly_inflation(inflation_rates)
 
-    # 3. Convert USD asset monthly returns to GBP
-    for usd_ticker in config.USD_ASSETS_TO_CONVERT:
-        convert_usd_to_gbp_returns(usd_ticker, config.FX_TICKER, config.GBP_MONTHLY_RETURNS_DIR)
+    # 3. Convert USD asset monthly returns to GBP (independent per asset)
+    Parallel(n_jobs=-1, backend='loky')(
+        delayed(convert_usd_to_gbp_returns)(usd_ticker, config.FX_TICKER, config.GBP_MONTHLY_RETURNS_DIR)
+        for usd_ticker in config.USD_ASSETS_TO_CONVERT
+    )
 
     # 4. Save monthly inflation rates
     start_month = (start_date_obj.month % 12) + 1
@@ -1,55 +1,85 @@
+import functools
+
+import numpy as np
+
 from tax_band import TaxBand
+
+# Default band sets per residency, resolved with one dict lookup at
+# construction. Armed forces members use the rUK bands regardless of residency.
+_RUK_BANDS = ((12570, 20), (50270, 40), (125140, 45))
+_DEFAULT_BANDS = {
+    "England": _RUK_BANDS,
+    "Northern_Ireland": _RUK_BANDS,
+    "Wales": _RUK_BANDS,
+    "Scotland": ((12570, 19), (15397, 20), (27491, 21),
+                 (43662, 42), (75000, 45), (125140, 48)),
+}
+
 class TaxBands:
 
     def __init__(self, tax_bands=None, residency=None, armed_forces=None):
-        if tax_band == None and residency == None:
+        if tax_bands is None and residency is None and not armed_forces:
             raise Exception("Tax bands or region must be specified")
-        if ((tax_bands is None and residency == "England") or (tax_bands == None and armed_forces == True) or
-                (tax_bands is None and residency == "Northern_Ireland")) or (tax_bands is None and residency == "Wales"):
-            tax_bands = [TaxBand(12570, 20), TaxBand(50270, 40),
-                         TaxBand(125140, 45)]
-        elif tax_bands is None and residency == "Scotland":
-            tax_bands = [TaxBand(12570, 19), TaxBand(15397, 20)
-                , TaxBand(27491, 21), TaxBand(43662, 42),
-                         TaxBand(75000, 45), TaxBand(125140, 48)]
+        if tax_bands is None:
+            defaults = _RUK_BANDS if armed_forces else _DEFAULT_BANDS.get(residency)
+            if defaults is None:
+                raise Exception(f"No default tax bands for residency: {residency}")
+            tax_bands = [TaxBand(band, rate) for band, rate in defaults]
 
         self.tax_bands = tax_bands
         self.loss_taxable_allowance_threshold = 100000
+        # Precomputed once: thresholds, rates, and each band's marginal rate
+        # increase over the band below, so yearly_tax_contribution is pure
+        # array arithmetic with no per-band Python dispatch.
+        self._band_thresholds = np.array([band.band for band in tax_bands], dtype=np.float64)
+        self._band_rates = np.array([band.tax_percentage for band in tax_bands], dtype=np.float64) / 100
+        self._marginal_rate_steps = np.diff(self._band_rates, prepend=0.0)
 
     def yearly_tax_contribution(self, yearly_gross_salary):
-        current_amount = yearly_gross_salary
-        tax_contribution = 0.0
-        yearly_bands = self.band_adjustment(yearly_gross_salary)
-
-        yearly_bands = reversed(yearly_bands)
+        """
+        Total yearly tax for a salary, or element-wise for an array of
+        salaries. Uses the identity tax = sum_i max(salary - threshold_i, 0)
+        * (rate_i - rate_{i-1}) over the allowance-adjusted thresholds.
+        """
+        salaries = np.asarray(yearly_gross_salary, dtype=np.float64)
 
-        for tax_band in yearly_bands:
-            if current_amount > tax_band.band:
-                tax_contribution += (current_amount - tax_band.band) * (tax_band.tax_percentage / 100)
-                current_amount = tax_band.band
+        # Personal-allowance taper: the first threshold shrinks by half the
+        # excess over 100k, capped at twice the first band.
+        excess = np.maximum(salaries - self.loss_taxable_allowance_threshold, 0.0)
+        band_reduction = np.minimum(excess, self._band_thresholds[0] * 2) / 2
+        adjusted_thresholds = np.where(
+            self._band_thresholds < self.loss_taxable_allowance_threshold,
+            self._band_thresholds - band_reduction[..., np.newaxis],
+            self._band_thresholds
+        )
 
-        return tax_contribution
+        taxable_above = np.maximum(salaries[..., np.newaxis] - adjusted_thresholds, 0.0)
+        tax_contribution = (taxable_above * self._marginal_rate_steps).sum(axis=-1)
+        return float(tax_contribution) if np.isscalar(yearly_gross_salary) else tax_contribution
 
+    @functools.lru_cache(maxsize=128)
     def band_adjustment(self, yearly_gross_salary):
-        new_bands = []
-        band_reduction = 0
-        first_band = self.tax_bands[0]
+        """
+        Allowance-adjusted band thresholds and their tax percentages for a
+        salary, as a pair of float tuples (thresholds, percentages). Plain
+        tuples avoid allocating a fresh TaxBand object per band per call,
+        and rounded salaries recur often enough that results are cached.
+        """
+        band_reduction = 0.0
         excess = yearly_gross_salary - self.loss_taxable_allowance_threshold
         if excess > 0:
-            band_reduction = min(excess, first_band.band * 2) / 2
-
-        for tax_band in self.tax_bands:
-            if tax_band.band < self.loss_taxable_allowance_threshold:
-                new_tax_band = TaxBand(tax_band.band - band_reduction, tax_band.tax_percentage)
-            else:
-                new_tax_band = TaxBand(tax_band.band, tax_band.tax_percentage)
-            new_bands.append(new_tax_band)
+            band_reduction = min(excess, self._band_thresholds[0] * 2) / 2
 
-        return new_bands
+        adjusted_thresholds = np.where(
+            self._band_thresholds < self.loss_taxable_allowance_threshold,
+            self._band_thresholds - band_reduction,
+            self._band_thresholds
+        )
+        return tuple(adjusted_thresholds.tolist()), tuple((self._band_rates * 100).tolist())
 
 
 if __name__ == "__main__":
-    tax_band = TaxBands()
+    tax_band = TaxBands(residency="England")
     print(tax_band.yearly_tax_contribution(100010)/ 52)
 
 
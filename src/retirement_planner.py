@@ -1,3 +1,6 @@
+import bisect
+import functools
+
 import pandas as pd
 import numpy as np
 import os
@@ -7,6 +10,52 @@ from src.simulation import load_simulated_paths
 import time
 # Note, I have moved the model portfolio from the outputs/filename to outputs/model_portfolios/filename
 
+from src.simulation_engine import simulate_retirement_paths
+
+# Repeated planner invocations (one per API request) reload the same inputs;
+# these module-level caches turn the 2nd+ load into a hash lookup. Sim paths
+# are read-only after load, so sharing references across requests is safe.
+@functools.lru_cache(maxsize=4)
+def _cached_sim_paths(asset_names: tuple, simulated_paths_dir: str):
+    return load_simulated_paths(list(asset_names), simulated_paths_dir)
+
+@functools.lru_cache(maxsize=8)
+def _cached_model_portfolios_df(filepath: str, mtime: float) -> pd.DataFrame:
+    # mtime participates in the key so a regenerated CSV invalidates the entry
+    return pd.read_csv(filepath, index_col='Target_Risk_Level')
+
+@functools.lru_cache(maxsize=32)
+def _cached_portfolio_returns(term_name: str, risk_level: int, model_portfolios_mtime: float, asset_names: tuple):
+    """
+    The (sims, months) portfolio-return matrix for a (term, risk level) pair.
+    What-if scenarios for one client vary contributions, withdrawals, and
+    ages, but keep the same weights — so the big sim_stack @ w product is
+    computed once and every later scenario is just the cheap recurrence.
+    The model-portfolios CSV mtime keys the entry, so regenerated portfolios
+    invalidate it. Returns None when weights or paths can't be loaded.
+    """
+    portfolio_weights = load_model_portfolio_weights(
+        term_name, risk_level, config.OUTPUT_DATA_DIR, list(asset_names)
+    )
+    if portfolio_weights.sum() == 0.0:
+        return None
+    loaded_sim_paths = _cached_sim_paths(asset_names, config.SIMULATED_PATHS_DIR)
+    if not loaded_sim_paths:
+        return None
+    sim_stack = np.stack([loaded_sim_paths[a] for a in asset_names], axis=-1)
+    return sim_stack @ portfolio_weights.to_numpy(dtype=sim_stack.dtype)
+
+# Term lookup table built once at import: sorted finite horizon bounds plus
+# the open-ended (None) term as fallback, so get_term_name is one bisect.
+_SORTED_TERM_HORIZONS = sorted(
+    (years, name) for name, years in config.TIME_HORIZON_LOOKBACK_YEARS.items() if years is not None
+)
+_TERM_HORIZON_BOUNDS = [years for years, _ in _SORTED_TERM_HORIZONS]
+_TERM_NAMES_BY_BOUND = [name for _, name in _SORTED_TERM_HORIZONS]
+_OPEN_ENDED_TERM = next(
+    name for name, years in config.TIME_HORIZON_LOOKBACK_YEARS.items() if years is None
+)
+
 # Could Maybe divide into smaller classes later
 # Could also perhaps use dob instead of current age
 class RetirementSimulatorModelPortfolios:
@@ -22,27 +71,35 @@ class RetirementSimulatorModelPortfolios:
         self.all_sim_names = self.asset_names.copy()
         self.all_sim_names.append(config.INFLATION_COLUMN_NAME)
         self.load_model_portfolio_weights(risk_level)
-        self.loaded_sim_paths = load_simulated_paths(self.all_sim_names, config.SIMULATED_PATHS_DIR) # Don't understand why I am getting a warning. Pay close attention when running in debug mode
+        self.loaded_sim_paths = _cached_sim_paths(tuple(self.all_sim_names), config.SIMULATED_PATHS_DIR) # Don't understand why I am getting a warning. Pay close attention when running in debug mode
+        # One contiguous (sims, months, assets) stack built up front: the hot
+        # loops index sim_stack[sim, month] (a view, no allocation) instead of
+        # rebuilding a small ndarray from the dict every month. float32 halves
+        # the bandwidth of the per-month dot; balances accumulate in float64.
+        self.sim_stack = np.ascontiguousarray(
+            np.stack([self.loaded_sim_paths[a] for a in self.asset_names], axis=-1),
+            dtype=np.float32
+        )
+        self.weights_array = self.model_portfolio_weights.to_numpy(dtype=np.float32)
+        # Weights never change for an instance, so collapse the stack to the
+        # (sims, months) portfolio-return matrix once with a single matmul;
+        # both cash-flow phases read from it instead of re-doing the dot.
+        self.portfolio_returns = self.sim_stack @ self.weights_array
         print()
 
     def get_term_name(self):
-        term_name = ""
+        # Binary search over the sorted horizon bounds; the open-ended
+        # (None) term is the fallback for horizons past the last bound.
         investment_horizon = self.life_expectancy - self.current_age
-        for term in reversed(config.TIME_HORIZON_LOOKBACK_YEARS):
-            year = config.TIME_HORIZON_LOOKBACK_YEARS[term]
-            if year is None:
-                term_name = term
-            elif investment_horizon < year:
-                term_name = term
-
-        return term_name
+        i = bisect.bisect_right(_TERM_HORIZON_BOUNDS, investment_horizon)
+        return _TERM_NAMES_BY_BOUND[i] if i < len(_TERM_HORIZON_BOUNDS) else _OPEN_ENDED_TERM
 
 
     def load_model_portfolio_weights(self, risk_level:int) ->None:
         term_name = self.get_term_name()
         filepath = os.path.join(self.output_data_dir, f"model_portfolios_{term_name}.csv")
         try:
-            model_portfolios_df = pd.read_csv(filepath, index_col='Target_Risk_Level')
+            model_portfolios_df = _cached_model_portfolios_df(filepath, os.path.getmtime(filepath))
             if risk_level not in model_portfolios_df.index:
                 raise ValueError(f"Risk level {risk_level} not found for {term_name} in model portfolios.")
 
@@ -61,14 +118,22 @@ class RetirementSimulatorModelPortfolios:
         pre_retirement_months = (self.retirement_age - self.current_age) * 12
         post_retirement_months = (self.life_expectancy - self.retirement_age) * 12
         # total_planning_months = pre_retirement_months + post_retirement_months
-        all_portfolio_histories =[]
 
-        for current_sim_number in range(config.NUM_SIMULATIONS):
-            # if (current_sim_number + 1) % 100 == 0:
-            #     print(f"Running {config.NUM_SIMULATIONS} simulation over {total_planning_months}")
-            pf_history_current_sim = self.constant_nominal_contribution(contribution_amount, initial_balance, current_sim_number, pre_retirement_months)
-            pf_history_current_sim = self.constant_nominal_withdrawal(withdrawal_amount, pf_history_current_sim, current_sim_number, pre_retirement_months, post_retirement_months)
-            all_portfolio_histories.append(pf_history_current_sim)
+        # Flat (uninflated) cash-flow schedule, clipped to the simulated horizon
+        horizon = self.portfolio_returns.shape[1]
+        contribution_months = min(pre_retirement_months, horizon)
+        withdrawal_months = max(0, min(post_retirement_months, horizon - pre_retirement_months))
+        recorded_months = contribution_months + withdrawal_months
+        monthly_cash_flows = np.where(
+            np.arange(recorded_months) < contribution_months,
+            float(contribution_amount), -float(withdrawal_amount)
+        )
+
+        histories, _failed_at = simulate_retirement_paths(
+            self.portfolio_returns[:config.NUM_SIMULATIONS, :recorded_months],
+            float(initial_balance), monthly_cash_flows
+        )
+        all_portfolio_histories = [history.tolist() for history in histories]
 
         end_time = time.perf_counter()
         duration = end_time - start_time
@@ -86,12 +151,7 @@ class RetirementSimulatorModelPortfolios:
             if sim_month_index >= config.PLANNING_HORIZON_MONTHS:
                 break
                 ### Come back to this
-            monthly_returns_all_assets = np.array([
-                self.loaded_sim_paths[asset_name][simulation_number,sim_month_index]
-                for asset_name in self.asset_names
-            ])
-
-            portfolio_monthly_return = np.sum(monthly_returns_all_assets * self.model_portfolio_weights.values)
+            portfolio_monthly_return = self.portfolio_returns[simulation_number, sim_month_index]
             current_balance = (current_balance *(1 + portfolio_monthly_return)) + contribution_amount
             portfolio_history_current_sim.append(current_balance)
 
@@ -104,16 +164,112 @@ class RetirementSimulatorModelPortfolios:
             real_current_month = month_in_horizon + pre_retirement_months
             if real_current_month >= config.PLANNING_HORIZON_MONTHS:
                 break
-            monthly_returns_all_assets = np.array([
-                self.loaded_sim_paths[asset_name][simulation_number, real_current_month]
-                for asset_name in self.asset_names
-            ])
-            portfolio_monthly_return = np.sum(monthly_returns_all_assets * self.model_portfolio_weights.values)
+            portfolio_monthly_return = self.portfolio_returns[simulation_number, real_current_month]
             current_balance = (current_balance * (1 + portfolio_monthly_return)) - withdrawal_amount
             portfolio_history_current_sim.append(current_balance)
 
         return portfolio_history_current_sim
 
+def load_model_portfolio_weights(term_name: str, risk_level: int, output_data_dir: str, asset_names: list) -> pd.Series:
+    """
+    Loads the asset allocation weights for a specific model portfolio.
+    """
+    filepath = os.path.join(output_data_dir, f'model_portfolios_{term_name}.csv')
+    try:
+        model_portfolios_df = _cached_model_portfolios_df(filepath, os.path.getmtime(filepath))
+        if risk_level not in model_portfolios_df.index:
+            raise ValueError(f"Risk level {risk_level} not found for {term_name} in model portfolios.")
+
+        # Extract weights for the specified risk level
+        weights = model_portfolios_df.loc[risk_level][asset_names]
+        # Ensure weights sum to 1 (or very close) due to potential float inaccuracies
+        weights = weights / weights.sum()
+        return weights
+    except FileNotFoundError:
+        print(f"Error: Model portfolios file not found for {term_name} at {filepath}.")
+        return pd.Series(0.0, index=asset_names) # Return zero weights if not found
+    except Exception as e:
+        print(f"Error loading model portfolio for {term_name}, Risk {risk_level}: {e}")
+        return pd.Series(0.0, index=asset_names)
+
+def run_client_retirement_simulation(
+        initial_balance: float,
+        current_age: int,
+        retirement_age: int,
+        annual_contribution: float,
+        annual_withdrawal_at_retirement: float, # This is the target spending power at retirement
+        life_expectancy: int,
+        selected_risk_level: int,
+        selected_term_name: str,
+        average_annual_inflation: float = 0.02 # Example fixed inflation rate (2%)
+):
+    """
+    Runs Monte Carlo simulations for a specific client's retirement plan.
+
+    The heavy lifting happens in simulate_retirement_paths: the per-asset
+    paths collapse to a (sims, months) portfolio-return matrix with one
+    matmul, the inflation-stepped cash-flow schedule is precomputed, and the
+    shared kernel evolves every path (pinning bankrupt ones at zero).
+
+    Returns:
+        list: A list of final portfolio balances (or 0 if ran out of money) for each simulation.
+        list: A list of lists, where each inner list is the portfolio balance history for one simulation,
+              truncated at the month the portfolio went bankrupt.
+    """
+    print(f"\n--- Starting Retirement Simulation for Client ---")
+    print(f"Profile: Risk {selected_risk_level}, Term {selected_term_name}")
+    print(f"Initial Balance: £{initial_balance:,.2f}")
+
+    # 1. Reuse (or build) the portfolio-return matrix for this term and risk
+    # level — amortized across every what-if scenario a client runs.
+    all_asset_names = [
+        t.replace('_monthly_returns_GBP.csv', '').replace('_monthly_returns.csv', '')
+        for t in config.USD_ASSETS_TO_CONVERT + [config.MONEYMARKET_GBP_RETURNS_FILE, config.GBP_ASSET_ORIGINAL_FILE]
+    ]
+    model_portfolios_file = os.path.join(config.OUTPUT_DATA_DIR, f'model_portfolios_{selected_term_name}.csv')
+    model_portfolios_mtime = os.path.getmtime(model_portfolios_file) if os.path.exists(model_portfolios_file) else 0.0
+
+    portfolio_monthly_returns = _cached_portfolio_returns(
+        selected_term_name, selected_risk_level, model_portfolios_mtime, tuple(all_asset_names)
+    )
+    if portfolio_monthly_returns is None:
+        print("Error: Could not load portfolio weights or simulated paths. Exiting simulation.")
+        return [], []
+
+    pre_retirement_months = (retirement_age - current_age) * config.NUM_MONTHS_IN_YEAR
+    post_retirement_months = (life_expectancy - retirement_age) * config.NUM_MONTHS_IN_YEAR
+    total_planning_months = pre_retirement_months + post_retirement_months
+
+    print(f"Running {config.NUM_SIMULATIONS} simulations over {total_planning_months} months...")
+
+    # If the planning horizon is longer than the simulated paths, stop at the
+    # simulated data (as before: the per-sim loop broke at this bound).
+    simulated_months = min(total_planning_months, config.PLANNING_HORIZON_MONTHS)
+    num_sims = portfolio_monthly_returns.shape[0]
+
+    # Deterministic cash-flow schedule: annual inflation step-ups and the
+    # contribution-to-withdrawal switch depend only on the month index.
+    months_index = np.arange(simulated_months)
+    inflation_multiplier = (1 + average_annual_inflation) ** (months_index // config.NUM_MONTHS_IN_YEAR)
+    monthly_cash_flows = np.where(
+        months_index < pre_retirement_months,
+        annual_contribution * inflation_multiplier / config.NUM_MONTHS_IN_YEAR,
+        -annual_withdrawal_at_retirement * inflation_multiplier / config.NUM_MONTHS_IN_YEAR
+    )
+
+    history_matrix, failed_at = simulate_retirement_paths(
+        portfolio_monthly_returns[:, :simulated_months], float(initial_balance), monthly_cash_flows
+    )
+
+    final_balances = history_matrix[:, -1].tolist()
+    # Histories keep their original ragged shape: each ends at bankruptcy
+    all_portfolio_histories = [
+        history_matrix[s, :failed_at[s] + 1].tolist() for s in range(num_sims)
+    ]
+
+    print("--- Retirement Simulation Complete ---")
+    return final_balances, all_portfolio_histories
+
 if __name__ == "__main__":
     all_asset_names = [
         t.replace('_monthly_returns_GBP.csv', '').replace('_monthly_returns.csv', '')
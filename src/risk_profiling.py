@@ -1,18 +1,110 @@
+import functools
+import logging
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Per-risk-level progress goes through logging so it is a level-gated no-op
+# in API contexts and does not interleave across worker processes.
+log = logging.getLogger(__name__)
 from src import config
 from src.simulation import load_simulated_paths
 from src.portfolio_analysis import calculate_portfolio_metrics # To reuse portfolio volatility calculation
 
-def calculate_max_drawdown(value_series: pd.Series) -> float:
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _mdd_batch(returns_3d, weights_matrix):
+        """
+        Fused drawdown kernel: for each (simulation, risk level) pair the
+        dot product, compounding, running peak, and worst drawdown all run
+        in one streaming pass, so no (sims, months, levels) temporaries are
+        materialized. Parallelized across simulations.
+        Returns an array of shape (simulations, levels).
+        """
+        num_sims, num_months, num_assets = returns_3d.shape
+        num_levels = weights_matrix.shape[1]
+        out = np.empty((num_sims, num_levels))
+        for s in prange(num_sims):
+            for l in range(num_levels):
+                value = 1.0
+                peak = 1.0
+                worst = 0.0
+                for m in range(num_months):
+                    monthly_return = 0.0
+                    for a in range(num_assets):
+                        monthly_return += returns_3d[s, m, a] * weights_matrix[a, l]
+                    value *= 1.0 + monthly_return
+                    if value > peak:
+                        peak = value
+                    drawdown = value / peak - 1.0
+                    if drawdown < worst:
+                        worst = drawdown
+                out[s, l] = worst
+        return out
+else:
+    def _mdd_batch(returns_3d, weights_matrix):
+        """
+        NumPy fallback used when numba is not installed: one GEMM across all
+        risk levels, then cumprod / maximum.accumulate for the drawdowns.
+        """
+        num_sims, num_months, num_assets = returns_3d.shape
+        portfolio_monthly_returns = (
+            returns_3d.reshape(-1, num_assets) @ weights_matrix
+        ).reshape(num_sims, num_months, weights_matrix.shape[1])
+        growth = np.cumprod(1.0 + portfolio_monthly_returns, axis=1)
+        peaks = np.maximum(np.maximum.accumulate(growth, axis=1), 1.0)
+        return (growth / peaks - 1.0).min(axis=1)
+
+def calculate_max_drawdown(value_series) -> float:
     """
-    Calculates the maximum drawdown for a given value series.
+    Calculates the maximum drawdown for a given value series (array-like).
     Drawdown is a negative percentage.
     """
-    peak_value = value_series.expanding(min_periods=1).max()
-    drawdown = (value_series / peak_value) - 1.0
-    return drawdown.min()
+    values = np.asarray(value_series, dtype=np.float64)
+    peak_values = np.maximum.accumulate(values)
+    return float((values / peak_values - 1.0).min())
+
+@functools.lru_cache(maxsize=4)
+def _cached_returns_3d(asset_names_tuple: tuple, simulated_paths_dir: str, dir_mtime: float):
+    """
+    Stacked (sims, months, assets) tensor, cached across calls. Keyed by the
+    simulated-paths directory's mtime so a re-bootstrap invalidates the
+    entry, the same freshness rule the planners' caches use. Returns None
+    when any requested asset's paths are missing.
+    """
+    loaded_sim_paths = load_simulated_paths(list(asset_names_tuple), simulated_paths_dir)
+    if not loaded_sim_paths or any(name not in loaded_sim_paths for name in asset_names_tuple):
+        return None
+    return np.ascontiguousarray(
+        np.stack([loaded_sim_paths[a] for a in asset_names_tuple], axis=-1), dtype=config.RISK_DTYPE
+    )
+
+@functools.lru_cache(maxsize=32)
+def _cached_first_percentile_drawdowns(asset_names_tuple: tuple, simulated_paths_dir: str,
+                                       dir_mtime: float, weights_bytes: bytes, num_levels: int):
+    """
+    1st-percentile max drawdown per risk level for one weights matrix,
+    cached across calls. The weights arrive as raw float64 bytes because
+    ndarrays are unhashable; repeated API invocations with unchanged inputs
+    skip both the disk reads and the drawdown kernel.
+    """
+    returns_3d = _cached_returns_3d(asset_names_tuple, simulated_paths_dir, dir_mtime)
+    # The tensor follows config.RISK_DTYPE (float32 by default, halving the
+    # bytes the kernel moves); the weights match so the GEMM fallback stays
+    # in sgemm instead of promoting everything back to double.
+    weights_matrix = np.ascontiguousarray(
+        np.frombuffer(weights_bytes, dtype=np.float64).reshape(-1, num_levels),
+        dtype=returns_3d.dtype
+    )
+    max_drawdowns_per_sim = _mdd_batch(returns_3d, weights_matrix)
+    return np.percentile(max_drawdowns_per_sim, 1, axis=0)
 
 def get_target_volatilities_for_risk_level_by_term(risk_term_dict: dict):
     target_volatilities = {}
@@ -24,10 +116,125 @@ def get_target_volatilities_for_risk_level_by_term(risk_term_dict: dict):
 
     return target_volatilities
 
+def _process_term(term_name: str, term_data: dict):
+    """
+    Worker for one time horizon: selects the model portfolios, computes their
+    simulated drawdowns, assigns risk levels, and writes the term's CSV.
+    Returns the summary DataFrame, or None when the term has to be skipped.
+    Runs in a worker process; the CSV write stays here so only the summary
+    crosses the pipe back to the parent.
+    """
+    print(f"\n===== Defining Model Portfolios for {term_name} term =====")
+    efficient_frontier_df = term_data['efficient_frontier_df']
+
+    if efficient_frontier_df.empty:
+        print(f"Skipping {term_name}: Efficient Frontier DataFrame is empty.")
+        return None
+
+    # Asset names from the efficient frontier columns (excluding metrics)
+    asset_names = [col for col in efficient_frontier_df.columns if col not in ['Volatility', 'Return', 'Sharpe_Ratio']]
+
+    # Load simulated paths (needed for drawdown calculation) as one stacked
+    # (sims, months, assets) tensor, cached across calls: every risk level's
+    # drawdown reduces to a matmul against its weight vector instead of a
+    # sims x months Python loop gathering asset returns.
+    # Assuming your simulated_paths_folder contains paths generated from the *full* history,
+    # as usually, simulations are based on the longest available data.
+    try:
+        sim_dir_mtime = os.path.getmtime(config.SIMULATED_PATHS_DIR)
+    except OSError:
+        sim_dir_mtime = 0.0
+    returns_3d = _cached_returns_3d(tuple(asset_names), config.SIMULATED_PATHS_DIR, sim_dir_mtime)
+    if returns_3d is None:
+        print(f"Error: Simulated paths not loaded for {term_name}. Cannot calculate max drawdowns for this term.")
+        return None
+
+    num_simulations = returns_3d.shape[0]
+    planning_horizon_months = returns_3d.shape[1]
+
+    # Get term-specific risk band definitions and target volatilities
+    term_risk_bands = config.risk_bands().get(term_name)
+    term_target_vols = get_target_volatilities_for_risk_level_by_term(term_risk_bands)
+
+    if not term_risk_bands or not term_target_vols:
+        print(f"Error: Risk band definitions or target volatilities not found for term '{term_name}'. Skipping.")
+        return None
+
+    # Pick each risk level's frontier portfolio with one broadcast
+    # |volatility - target| argmin over the whole frontier, then gather all
+    # the rows with a single .iloc instead of one .copy() per level.
+    risk_levels = sorted(term_target_vols.keys())
+    target_vols = np.array([term_target_vols[r] for r in risk_levels])
+    frontier_vols = efficient_frontier_df['Volatility'].to_numpy()
+    selected_positions = np.abs(frontier_vols[:, None] - target_vols[None, :]).argmin(axis=0)
+    model_portfolios_summary_df = efficient_frontier_df.iloc[selected_positions].reset_index(drop=True)
+
+    # All risk levels share the same return tensor, so the whole batch
+    # runs through one kernel call: fused numba loop when available,
+    # otherwise a (S*M, A) @ (A, R) GEMM fallback. Either way the peak is
+    # clamped at the initial value 1.0 the old per-sim series included,
+    # and the 1st-percentile reduction covers every level at once. The
+    # result is cached, so a repeat call with unchanged weights and paths
+    # skips the kernel entirely.
+    weights_matrix = np.ascontiguousarray(model_portfolios_summary_df[asset_names].to_numpy(dtype=np.float64).T)
+    first_percentile_drawdowns = _cached_first_percentile_drawdowns(
+        tuple(asset_names), config.SIMULATED_PATHS_DIR, sim_dir_mtime,
+        weights_matrix.tobytes(), weights_matrix.shape[1]
+    )
+
+    # --- Assign Final Risk Levels based on Combined Criteria ("Highest Risk Wins") ---
+    # Bands are contiguous, so searchsorted on the vol_max column replaces
+    # the per-level dict walk; below band 1 / above band 10 clamp to the
+    # extremes, matching the old fallbacks. The dd_max thresholds deepen
+    # with the level, so the highest breached level is a searchsorted count
+    # over the reversed (ascending) column, with the same level-1 fallback
+    # for drawdowns shallower than every threshold. Both lookups run
+    # vectorized across all levels at once.
+    term_band_array = config.risk_band_array()[config.TERM_INDEX[term_name]]
+    selected_vols = model_portfolios_summary_df['Volatility'].to_numpy()
+    vol_risk_levels = np.clip(np.searchsorted(term_band_array[:, 1], selected_vols, side='right') + 1, 1, 10)
+    dd_thresholds = term_band_array[:, 2]
+    dd_risk_levels = len(dd_thresholds) - np.searchsorted(dd_thresholds[::-1], first_percentile_drawdowns, side='left')
+    dd_risk_levels = np.maximum(dd_risk_levels, 1)
+    final_assigned_risk_levels = np.maximum(vol_risk_levels, dd_risk_levels)
+
+    # One vectorized column assignment per metric instead of R dicts plus a
+    # dict-of-dicts transpose at the end.
+    model_portfolios_summary_df['Simulated_1st_Percentile_Max_Drawdown'] = first_percentile_drawdowns
+    model_portfolios_summary_df['Vol_Risk_Level_Assigned'] = vol_risk_levels
+    model_portfolios_summary_df['DD_Risk_Level_Assigned'] = dd_risk_levels
+    model_portfolios_summary_df['Final_Assigned_Risk_Level'] = final_assigned_risk_levels
+    model_portfolios_summary_df.index = pd.Index(risk_levels, name='Target_Risk_Level')
+
+    for level_idx, risk_level in enumerate(risk_levels):
+        log.info("Processing Risk %s (Target Vol: %.2f%%):", risk_level, target_vols[level_idx] * 100)
+        log.info("  Selected MVO Portfolio (Vol: %.2f%%, Return: %.2f%%)...",
+                 selected_vols[level_idx] * 100, model_portfolios_summary_df['Return'].iloc[level_idx] * 100)
+        log.info("  Calculated 1st Percentile Max Drawdown: %.2f%%", first_percentile_drawdowns[level_idx] * 100)
+        log.info("  Assigned Risk Level (Volatility): %s", vol_risk_levels[level_idx])
+        log.info("  Assigned Risk Level (Drawdown): %s", dd_risk_levels[level_idx])
+        log.info("  Final Assigned Risk Level: %s", final_assigned_risk_levels[level_idx])
+        log.info("=" * 50)
+
+    print(f"\n--- Summary of Final Model Portfolios for {term_name} ---")
+    print(model_portfolios_summary_df[[
+        'Volatility', 'Return', 'Simulated_1st_Percentile_Max_Drawdown',
+        'Vol_Risk_Level_Assigned', 'DD_Risk_Level_Assigned', 'Final_Assigned_Risk_Level'
+    ]].round(4))
+
+    # Save to a term-specific file
+    output_filepath = os.path.join(config.OUTPUT_DATA_DIR, f'model_portfolios_{term_name}.csv')
+    model_portfolios_summary_df.to_csv(output_filepath)
+    print(f"Model portfolios for {term_name} saved to '{output_filepath}'.")
+
+    return model_portfolios_summary_df
+
 def define_and_select_model_portfolios_by_term(all_term_results: dict):
     """
     Defines risk bands and identifies model portfolios for each time horizon.
-    Calculates their simulated maximum drawdowns.
+    Calculates their simulated maximum drawdowns. Terms are fully
+    independent, so each one runs in its own worker process, mirroring the
+    per-term MVO sweep in portfolio_analysis.
     """
     if not all_term_results:
         print("Error: No portfolio analysis results provided. Cannot define model portfolios.")
@@ -35,124 +242,15 @@ def define_and_select_model_portfolios_by_term(all_term_results: dict):
 
     all_term_model_portfolios = {} # To store the final model portfolio DataFrames by term
 
-    for term_name, term_data in all_term_results.items():
-        print(f"\n===== Defining Model Portfolios for {term_name} term =====")
-        efficient_frontier_df = term_data['efficient_frontier_df']
-
-        if efficient_frontier_df.empty:
-            print(f"Skipping {term_name}: Efficient Frontier DataFrame is empty.")
-            continue
-
-        # Asset names from the efficient frontier columns (excluding metrics)
-        asset_names = [col for col in efficient_frontier_df.columns if col not in ['Volatility', 'Return', 'Sharpe_Ratio']]
-
-        # Load simulated paths (needed for drawdown calculation)
-        # Assuming your simulated_paths_folder contains paths generated from the *full* history,
-        # as usually, simulations are based on the longest available data.
-        loaded_sim_paths = load_simulated_paths(asset_names, config.SIMULATED_PATHS_DIR)
-        if not loaded_sim_paths:
-            print(f"Error: Simulated paths not loaded for {term_name}. Cannot calculate max drawdowns for this term.")
-            continue # Skip to next term if sim data isn't there
-
-        num_simulations = loaded_sim_paths[asset_names[0]].shape[0]
-        planning_horizon_months = loaded_sim_paths[asset_names[0]].shape[1]
-
-        final_model_portfolios_for_term = {}
-
-        # Get term-specific risk band definitions and target volatilities
-        term_risk_bands = config.RISK_BAND_DEFINITIONS_BY_TERM.get(term_name)
-        term_target_vols = get_target_volatilities_for_risk_level_by_term(term_risk_bands)
-
-        if not term_risk_bands or not term_target_vols:
-            print(f"Error: Risk band definitions or target volatilities not found for term '{term_name}'. Skipping.")
-            continue
-
-
-        # Iterate through each desired risk level based on target volatilities
-        for risk_level in sorted(term_target_vols.keys()):
-            target_vol = term_target_vols[risk_level]
-
-            # Find the portfolio on the efficient frontier closest to the target volatility
-            idx = (efficient_frontier_df['Volatility'] - target_vol).abs().idxmin()
-            selected_portfolio_mvo = efficient_frontier_df.loc[idx].copy()
-
-            print(f"Processing Risk {risk_level} (Target Vol: {target_vol:.2%}):")
-            print(f"  Selected MVO Portfolio (Vol: {selected_portfolio_mvo['Volatility']:.2%}, Return: {selected_portfolio_mvo['Return']:.2%})...")
-
-            # --- Calculate Max Drawdown for this selected portfolio using simulated_asset_paths ---
-            portfolio_weights = selected_portfolio_mvo[asset_names].values
-
-            max_drawdowns_for_this_portfolio_sims = []
-
-            for sim_idx in range(num_simulations):
-                initial_value = 1.0
-                portfolio_values = [initial_value]
-
-                for month_idx in range(planning_horizon_months):
-                    monthly_returns_all_assets = np.array([
-                        loaded_sim_paths[asset_name][sim_idx, month_idx]
-                        for asset_name in asset_names
-                    ])
-
-                    portfolio_monthly_return = np.sum(monthly_returns_all_assets * portfolio_weights)
-                    portfolio_values.append(portfolio_values[-1] * (1 + portfolio_monthly_return))
-
-                portfolio_value_series = pd.Series(portfolio_values)
-                max_drawdowns_for_this_portfolio_sims.append(calculate_max_drawdown(portfolio_value_series))
-
-            simulated_1st_percentile_max_drawdown = np.percentile(max_drawdowns_for_this_portfolio_sims, 1)
-
-            # --- Assign Final Risk Level based on Combined Criteria ("Highest Risk Wins") ---
-
-            vol_risk_level = 0
-            actual_volatility = selected_portfolio_mvo['Volatility']
-            for r_lvl, defs in term_risk_bands.items():
-                if actual_volatility >= defs['vol_min'] and actual_volatility < defs['vol_max']:
-                    vol_risk_level = r_lvl
-                    break
-            if vol_risk_level == 0 and actual_volatility >= term_risk_bands[10]['vol_min']:
-                vol_risk_level = 10
-            if vol_risk_level == 0: vol_risk_level = 1
-
-            dd_risk_level = 0
-            actual_max_drawdown = simulated_1st_percentile_max_drawdown
-            for r_lvl in sorted(term_risk_bands.keys(), reverse=True):
-                if actual_max_drawdown <= term_risk_bands[r_lvl]['dd_max']:
-                    dd_risk_level = r_lvl
-                    break
-            if dd_risk_level == 0: dd_risk_level = 1
-
-            final_assigned_risk_level = max(vol_risk_level, dd_risk_level)
-
-            portfolio_data_dict = selected_portfolio_mvo.to_dict()
-            portfolio_data_dict['Simulated_1st_Percentile_Max_Drawdown'] = simulated_1st_percentile_max_drawdown
-            portfolio_data_dict['Vol_Risk_Level_Assigned'] = vol_risk_level
-            portfolio_data_dict['DD_Risk_Level_Assigned'] = dd_risk_level
-            portfolio_data_dict['Final_Assigned_Risk_Level'] = final_assigned_risk_level
-
-            final_model_portfolios_for_term[risk_level] = portfolio_data_dict
-
-            print(f"  Calculated 1st Percentile Max Drawdown: {simulated_1st_percentile_max_drawdown:.2%}")
-            print(f"  Assigned Risk Level (Volatility): {vol_risk_level}")
-            print(f"  Assigned Risk Level (Drawdown): {dd_risk_level}")
-            print(f"  Final Assigned Risk Level: {final_assigned_risk_level}")
-            print("=" * 50)
-
-        model_portfolios_summary_df = pd.DataFrame(final_model_portfolios_for_term).T
-        model_portfolios_summary_df.index.name = 'Target_Risk_Level'
-
-        print(f"\n--- Summary of Final Model Portfolios for {term_name} ---")
-        print(model_portfolios_summary_df[[
-            'Volatility', 'Return', 'Simulated_1st_Percentile_Max_Drawdown',
-            'Vol_Risk_Level_Assigned', 'DD_Risk_Level_Assigned', 'Final_Assigned_Risk_Level'
-        ]].round(4))
-
-        # Save to a term-specific file
-        output_filepath = os.path.join(config.OUTPUT_DATA_DIR, f'model_portfolios_{term_name}.csv')
-        model_portfolios_summary_df.to_csv(output_filepath)
-        print(f"Model portfolios for {term_name} saved to '{output_filepath}'.")
-
-        all_term_model_portfolios[term_name] = model_portfolios_summary_df # Store for overall return
+    with ProcessPoolExecutor(max_workers=min(len(all_term_results), os.cpu_count() or 1)) as executor:
+        futures = {
+            term_name: executor.submit(_process_term, term_name, term_data)
+            for term_name, term_data in all_term_results.items()
+        }
+        for term_name, future in futures.items():
+            model_portfolios_summary_df = future.result()
+            if model_portfolios_summary_df is not None:
+                all_term_model_portfolios[term_name] = model_portfolios_summary_df
 
     print("\n--- All Model Portfolios by Term Defined ---")
-    return all_term_model_portfolios
\ No newline at end of file
+    return all_term_model_portfolios
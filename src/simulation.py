@@ -1,12 +1,52 @@
 import pandas as pd
 import numpy as np
 import os
+import json
+import logging
 from src import config
 from src.data_processing import consolidate_gbp_returns # Import the function to get combined data
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Per-asset progress goes through logging so it is a level-gated no-op in
+# API contexts; summaries and errors stay on stdout.
+log = logging.getLogger(__name__)
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _bootstrap_paths(returns_matrix, random_indices):
+        """
+        Bootstrap kernel: gathers whole historical months with replacement
+        using the pre-drawn (simulations, months) index array. Compiled with
+        parallel=True, so simulations run across all cores.
+        Returns an array of shape (simulations, months, assets).
+        """
+        num_simulations, num_months = random_indices.shape
+        num_assets = returns_matrix.shape[1]
+        out = np.empty((num_simulations, num_months, num_assets), dtype=returns_matrix.dtype)
+        for s in prange(num_simulations):
+            for m in range(num_months):
+                out[s, m] = returns_matrix[random_indices[s, m]]
+        return out
+else:
+    def _bootstrap_paths(returns_matrix, random_indices):
+        """
+        Pure-NumPy fallback used when numba is not installed.
+        """
+        return returns_matrix[random_indices]
+
 def run_historical_bootstrapping(combined_returns_df: pd.DataFrame):
     """
     Performs historical bootstrapping Monte Carlo simulations and saves asset paths.
+
+    The simulation works on a float32 copy of the consolidated returns:
+    the bootstrap gather is memory-bandwidth-bound and monthly returns
+    (~1e-2) are far above float32 epsilon. The float64 DataFrame itself is
+    untouched, since MVO needs the full precision for covariance work.
     """
     asset_names = combined_returns_df.columns.tolist()
     num_historical_months = len(combined_returns_df)
@@ -22,23 +62,18 @@ def run_historical_bootstrapping(combined_returns_df: pd.DataFrame):
     print(f"\n--- Running {config.NUM_SIMULATIONS} Monte Carlo Simulations ({config.PLANNING_HORIZON_YEARS} years horizon) ---")
     print("Using Historical Bootstrapping method...")
 
-    simulated_asset_paths = {col: [] for col in asset_names}
-
-    for s in range(config.NUM_SIMULATIONS):
-        if (s + 1) % 1000 == 0:
-            print(f"Simulations complete: {s + 1} / {config.NUM_SIMULATIONS}")
-
-        current_sim_returns_for_assets = {col: [] for col in asset_names}
-
-        for month_idx in range(config.PLANNING_HORIZON_MONTHS):
-            random_index = np.random.randint(0, num_historical_months)
-            historical_returns_this_month = combined_returns_df.iloc[random_index]
-
-            for asset_name, return_val in historical_returns_this_month.items():
-                current_sim_returns_for_assets[asset_name].append(return_val)
-
-        for asset_name in asset_names:
-            simulated_asset_paths[asset_name].append(current_sim_returns_for_assets[asset_name])
+    # Hand the hot loop a plain float64 matrix; the per-month sampling runs
+    # in the compiled kernel rather than through pandas row indexing.
+    # Indices are drawn in one bulk rng.integers call (PCG64) as uint16 —
+    # far fewer than 65535 historical months — keeping the index array small.
+    returns_matrix = combined_returns_df.to_numpy(dtype=config.RISK_DTYPE, copy=True)
+    rng = np.random.default_rng()
+    random_indices = rng.integers(
+        0, num_historical_months,
+        size=(config.NUM_SIMULATIONS, config.PLANNING_HORIZON_MONTHS),
+        dtype=np.uint16
+    )
+    all_paths = _bootstrap_paths(returns_matrix, random_indices)
 
     print("\n--- Monte Carlo Simulation Complete ---")
 
@@ -46,24 +81,72 @@ def run_historical_bootstrapping(combined_returns_df: pd.DataFrame):
     print("\n--- Verifying and Saving Simulated Data ---")
     os.makedirs(config.SIMULATED_PATHS_DIR, exist_ok=True)
 
-    for asset_name, paths in simulated_asset_paths.items():
-        data_array = np.array(paths)
+    for asset_idx, asset_name in enumerate(asset_names):
+        data_array = all_paths[:, :, asset_idx]
         np.save(os.path.join(config.SIMULATED_PATHS_DIR, f"{asset_name}_simulated_returns.npy"), data_array)
-        print(f"Asset '{asset_name}': Shape of simulated paths is {data_array.shape} (Simulations x Months)")
+        log.info("Asset '%s': Shape of simulated paths is %s (Simulations x Months)", asset_name, data_array.shape)
+
+    # Also save the whole cube as one contiguous (sims, months, assets)
+    # tensor with a JSON sidecar mapping asset name -> axis-2 index, so
+    # loading is a single sequential read instead of one file per asset.
+    np.save(os.path.join(config.SIMULATED_PATHS_DIR, "all_simulated_returns.npy"), all_paths)
+    with open(os.path.join(config.SIMULATED_PATHS_DIR, "all_simulated_returns_index.json"), "w") as f:
+        json.dump({name: idx for idx, name in enumerate(asset_names)}, f)
 
     print(f"\nAll simulated asset paths saved to the '{config.SIMULATED_PATHS_DIR}' folder.")
 
+def _load_combined_simulated_paths(asset_names: list, simulated_paths_dir: str):
+    """
+    Tries the single (sims, months, assets) tensor written by
+    run_historical_bootstrapping. Returns a dict of zero-copy memory-mapped
+    views keyed by asset name, or None when the tensor is missing, lacks a
+    requested asset, or is staler than a per-asset file (same mtime rule as
+    the parquet siblings in data_processing).
+    """
+    tensor_path = os.path.join(simulated_paths_dir, "all_simulated_returns.npy")
+    index_path = os.path.join(simulated_paths_dir, "all_simulated_returns_index.json")
+    if not (os.path.exists(tensor_path) and os.path.exists(index_path)):
+        return None
+    try:
+        with open(index_path) as f:
+            asset_index = json.load(f)
+        if any(name not in asset_index for name in asset_names):
+            return None
+        tensor_mtime = os.path.getmtime(tensor_path)
+        for name in asset_names:
+            per_asset_path = os.path.join(simulated_paths_dir, f"{name}_simulated_returns.npy")
+            if os.path.exists(per_asset_path) and os.path.getmtime(per_asset_path) > tensor_mtime:
+                return None
+        tensor = np.load(tensor_path, mmap_mode='r').astype(config.RISK_DTYPE, copy=False)
+        print(f"Loaded combined simulated-path tensor: {tensor.shape} (Simulations x Months x Assets)")
+        return {name: tensor[:, :, asset_index[name]] for name in asset_names}
+    except Exception as e:
+        print(f"An error occurred loading the combined simulated-path tensor: {e}")
+        return None
+
 def load_simulated_paths(asset_names: list, simulated_paths_dir: str):
     """
-    Loads simulated asset paths from .npy files.
+    Loads simulated asset paths as read-only float32 memory maps: nothing is
+    read from disk until a month is actually touched, so construction cost
+    and resident memory stay proportional to the months used rather than the
+    whole cube. The planners' per-month dot products are memory-bound, and
+    float32 halves the bytes moved. The combined tensor written by
+    run_historical_bootstrapping is preferred (one file open, one sidecar
+    lookup); per-asset .npy files remain as the fallback for directories
+    bootstrapped before the tensor existed. Older float64 files are converted
+    (and thereby materialized) on load.
     """
+    combined_paths = _load_combined_simulated_paths(asset_names, simulated_paths_dir)
+    if combined_paths is not None:
+        return combined_paths
+
     loaded_paths = {}
     print(f"\n--- Loading Simulated Paths from '{simulated_paths_dir}' ---")
     for asset_name in asset_names:
         file_path = os.path.join(simulated_paths_dir, f"{asset_name}_simulated_returns.npy")
         try:
-            loaded_paths[asset_name] = np.load(file_path)
-            print(f"Loaded {asset_name}: {loaded_paths[asset_name].shape}")
+            loaded_paths[asset_name] = np.load(file_path, mmap_mode='r').astype(config.RISK_DTYPE, copy=False)
+            log.info("Loaded %s: %s", asset_name, loaded_paths[asset_name].shape)
         except FileNotFoundError:
             print(f"Error: Simulated path file not found for {asset_name} at {file_path}. Skipping.")
         except Exception as e:
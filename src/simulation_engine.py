@@ -0,0 +1,50 @@
+# src/simulation_engine.py
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+def simulate_retirement_paths(portfolio_returns, initial_balance, monthly_cash_flows):
+    """
+    Shared retirement-simulation kernel used by every planner entry point.
+
+    Evolves each path's balance through the recurrence
+        balance = balance * (1 + portfolio_returns[s, m]) + monthly_cash_flows[m]
+    where monthly_cash_flows encodes the whole contribution/withdrawal
+    schedule (positive pre-retirement, negative post-retirement, with any
+    inflation step-ups already applied). A path that hits zero is bankrupt:
+    its balance is pinned at zero for the rest of the horizon.
+
+    The recurrence is sequential in time but independent across paths, so the
+    outer loop runs under numba prange when available; otherwise the same
+    function executes as pure Python.
+
+    Returns:
+        histories: (sims, months + 1) float64 array of balances, first column
+            is the initial balance; zero from the bankruptcy month onward.
+        failed_at: (sims,) int64 array with the month index at which each
+            path went bankrupt (months = never).
+    """
+    num_sims, num_months = portfolio_returns.shape
+    histories = np.empty((num_sims, num_months + 1), dtype=np.float64)
+    failed_at = np.full(num_sims, num_months, dtype=np.int64)
+    for s in prange(num_sims):
+        balance = initial_balance
+        histories[s, 0] = balance
+        for m in range(num_months):
+            balance = balance * (1 + portfolio_returns[s, m]) + monthly_cash_flows[m]
+            if balance <= 0.0:
+                failed_at[s] = m + 1
+                for k in range(m + 1, num_months + 1):
+                    histories[s, k] = 0.0
+                break
+            histories[s, m + 1] = balance
+    return histories, failed_at
+
+if NUMBA_AVAILABLE:
+    simulate_retirement_paths = njit(parallel=True, cache=True, fastmath=True)(simulate_retirement_paths)